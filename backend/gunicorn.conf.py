@@ -0,0 +1,29 @@
+# Production server config: gunicorn main:app -c gunicorn.conf.py
+import multiprocessing
+import os
+
+bind = "0.0.0.0:8001"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# Load the app once in the master so workers share the breed database copy-on-write
+preload_app = True
+
+# Keep logging off the hot path
+loglevel = "warning"
+accesslog = None
+
+def pre_fork(server, worker):
+    """Assign the new worker a core no live worker holds (runs in the master)"""
+    if not hasattr(os, "sched_getaffinity"):
+        return
+    cores = sorted(os.sched_getaffinity(0))
+    taken = [w.core for w in server.WORKERS.values() if getattr(w, "core", None) is not None]
+    free = [core for core in cores if core not in taken]
+    # More workers than cores: share the least-loaded core
+    worker.core = free[0] if free else min(cores, key=taken.count)
+
+def post_fork(server, worker):
+    """Pin each worker to its assigned core"""
+    if getattr(worker, "core", None) is not None:
+        os.sched_setaffinity(0, {worker.core})
@@ -1,26 +1,62 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, FileResponse
 import uvicorn
+import orjson
+import msgspec
+import asyncio
+import hashlib
 import time
 import random
+import bisect
+import itertools
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from functools import lru_cache
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from contextlib import asynccontextmanager
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: handlers only enqueue, a listener thread does the I/O
+_log_queue_handler = QueueHandler(queue.SimpleQueue())
+_log_listener: Optional[QueueListener] = None
+
+def _start_log_listener():
+    """Start a listener thread draining a fresh log queue"""
+    global _log_listener
+    _log_queue_handler.queue = queue.SimpleQueue()
+    _log_listener = QueueListener(_log_queue_handler.queue, logging.StreamHandler(), respect_handler_level=True)
+    _log_listener.start()
+
+def _stop_log_listener():
+    """Flush and stop the listener thread, if running"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+# Started at import so records are written even without lifespan; forked
+# workers don't inherit the thread, so each child starts its own
+_start_log_listener()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_start_log_listener)
+
+logging.basicConfig(level=logging.WARNING, handlers=[_log_queue_handler])
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Restart the listener if a previous lifespan cycle stopped it
+    if _log_listener is None:
+        _start_log_listener()
     logger.info("🚀 Cattle Breed Identifier API starting...")
     yield
     logger.info("🔄 Cattle Breed Identifier API shutting down...")
+    _stop_log_listener()
 
 app = FastAPI(
     title="🐄 Cattle & Buffalo Breed Identifier",
@@ -28,18 +64,28 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Enhanced CORS middleware
+# Enhanced CORS middleware; FRONTEND_ORIGIN takes a comma-separated list
+FRONTEND_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("FRONTEND_ORIGIN", "http://localhost:5173").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=FRONTEND_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
+# Response compression (added after CORS so it wraps the CORS-decorated response)
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
 # Comprehensive breed database with enhanced data
 COMPREHENSIVE_BREED_DATABASE = {
     "gir": {
@@ -204,6 +250,35 @@ COMPREHENSIVE_BREED_DATABASE = {
     }
 }
 
+# Breed images under /static are served by nginx or a CDN, never by this app.
+# With CDN_BASE set, image URLs are rewritten to absolute CDN URLs.
+CDN_BASE = os.getenv("CDN_BASE", "").rstrip("/")
+if CDN_BASE:
+    for _breed in COMPREHENSIVE_BREED_DATABASE.values():
+        _breed["image_url"] = CDN_BASE + _breed["image_url"]
+
+# Static breed views, computed once at import
+_ALL_BREEDS = list(COMPREHENSIVE_BREED_DATABASE.values())
+_CATTLE_BREEDS = [breed for breed in _ALL_BREEDS if breed["type"] == "Cattle"]
+_BUFFALO_BREEDS = [breed for breed in _ALL_BREEDS if breed["type"] == "Buffalo"]
+_BREEDS_BY_ID = {breed["id"]: breed for breed in _ALL_BREEDS}
+
+# Upload limits
+MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5MB
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Identification sampling: dedicated RNG and cumulative breed weights
+_RNG = random.Random()
+# Preloaded workers would otherwise share one RNG state; reseed like the stdlib does
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_RNG.seed)
+_BREED_KEYS = list(COMPREHENSIVE_BREED_DATABASE.keys())
+_BREED_WEIGHTS = [0.25, 0.25, 0.30, 0.15, 0.05]  # Realistic distribution
+_CUM_WEIGHTS = list(itertools.accumulate(_BREED_WEIGHTS))
+
+# Fake model latency for demos only; off unless SIMULATE_LATENCY is set
+SIMULATE_LATENCY = bool(os.getenv("SIMULATE_LATENCY"))
+
 # Global stats
 GLOBAL_STATS = {
     "total_identifications": 25847,
@@ -215,215 +290,397 @@ GLOBAL_STATS = {
     "daily_uploads": 156
 }
 
+# Pre-serialized static responses, built once at import
+TIMESTAMP_PLACEHOLDER = "__TIMESTAMP__"
+_TIMESTAMP_TOKEN = orjson.dumps(TIMESTAMP_PLACEHOLDER)
+
+ROOT_RESPONSE_BYTES = b""
+HEALTH_RESPONSE_BYTES = b""
+BREEDS_RESPONSE_BYTES = b""
+BREEDS_ETAG = ""
+BREED_DETAIL_BYTES: Dict[int, bytes] = {}
+BREED_DETAIL_ETAGS: Dict[int, str] = {}
+
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+def build_static_responses():
+    """Serialize the static endpoint payloads once"""
+    global ROOT_RESPONSE_BYTES, HEALTH_RESPONSE_BYTES, BREEDS_RESPONSE_BYTES, BREEDS_ETAG
+    ROOT_RESPONSE_BYTES = orjson.dumps({
+        "status": "✅ Online",
+        "service": "Cattle & Buffalo Breed Identifier",
+        "version": "2.0.0",
+        "message": "🐄 Advanced AI-powered breed identification system",
+        "timestamp": TIMESTAMP_PLACEHOLDER,
+        "endpoints": {
+            "identify": "/api/v1/identify",
+            "identify_raw": "/api/v1/identify-raw",
+            "breeds": "/api/v1/breeds",
+            "breed_details": "/api/v1/breeds/{id}",
+            "stats": "/api/v1/stats",
+            "health": "/health"
+        }
+    })
+    HEALTH_RESPONSE_BYTES = orjson.dumps({
+        "status": "healthy",
+        "service": "cattle-breed-identifier-v2",
+        "timestamp": TIMESTAMP_PLACEHOLDER,
+        "breeds_loaded": len(COMPREHENSIVE_BREED_DATABASE),
+        "uptime": "Running smoothly",
+        "database": "Connected",
+        "ai_model": "Active"
+    })
+    # Breed payloads carry no timestamp so identical data yields identical bytes
+    BREEDS_RESPONSE_BYTES = orjson.dumps({
+        "success": True,
+        "total_breeds": len(_ALL_BREEDS),
+        "cattle_count": len(_CATTLE_BREEDS),
+        "buffalo_count": len(_BUFFALO_BREEDS),
+        # No "all" list: it repeated every breed; clients concatenate cattle + buffalo
+        "breeds": {
+            "cattle": _CATTLE_BREEDS,
+            "buffalo": _BUFFALO_BREEDS
+        }
+    })
+    BREEDS_ETAG = compute_etag(BREEDS_RESPONSE_BYTES)
+    BREED_DETAIL_BYTES.clear()
+    BREED_DETAIL_ETAGS.clear()
+    for breed_id, breed in _BREEDS_BY_ID.items():
+        BREED_DETAIL_BYTES[breed_id] = orjson.dumps({
+            "success": True,
+            "breed": breed
+        })
+        BREED_DETAIL_ETAGS[breed_id] = compute_etag(BREED_DETAIL_BYTES[breed_id])
+
+def compute_etag(payload: bytes) -> str:
+    """Weak ETag derived from the served payload (GZip re-encodes the body)"""
+    return 'W/"' + hashlib.sha256(payload).hexdigest()[:16] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    opaque_tag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque_tag:
+            return True
+    return False
+
+def cached_json_response(request: Request, payload: bytes, etag: str) -> Response:
+    """Serve cacheable JSON, answering 304 when the client already has it"""
+    headers = {"ETag": etag, "Cache-Control": STATIC_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+def with_timestamp(payload: bytes) -> bytes:
+    """Splice the current time into a pre-serialized payload"""
+    return payload.replace(_TIMESTAMP_TOKEN, orjson.dumps(datetime.now()), 1)
+
+# All inputs are known at import, so the app does not depend on lifespan running
+build_static_responses()
+
 # Health check endpoint
-@app.get("/", response_class=JSONResponse)
+@app.get("/")
 async def root():
-    return JSONResponse(
-        status_code=200,
-        content={
-            "status": "✅ Online",
-            "service": "Cattle & Buffalo Breed Identifier",
-            "version": "2.0.0",
-            "message": "🐄 Advanced AI-powered breed identification system",
-            "timestamp": datetime.now().isoformat(),
-            "endpoints": {
-                "identify": "/api/v1/identify",
-                "breeds": "/api/v1/breeds",
-                "breed_details": "/api/v1/breeds/{id}",
-                "stats": "/api/v1/stats",
-                "health": "/health"
-            }
-        }
-    )
+    return Response(content=with_timestamp(ROOT_RESPONSE_BYTES), media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return JSONResponse(
-        status_code=200,
-        content={
-            "status": "healthy",
-            "service": "cattle-breed-identifier-v2",
-            "timestamp": datetime.now().isoformat(),
-            "breeds_loaded": len(COMPREHENSIVE_BREED_DATABASE),
-            "uptime": "Running smoothly",
-            "database": "Connected",
-            "ai_model": "Active"
-        }
-    )
+    return Response(content=with_timestamp(HEALTH_RESPONSE_BYTES), media_type="application/json")
 
 @app.get("/api/v1/breeds")
-async def get_all_breeds():
+async def get_all_breeds(request: Request):
     try:
-        cattle_breeds = [breed for breed in COMPREHENSIVE_BREED_DATABASE.values() if breed["type"] == "Cattle"]
-        buffalo_breeds = [breed for breed in COMPREHENSIVE_BREED_DATABASE.values() if breed["type"] == "Buffalo"]
-        
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "total_breeds": len(COMPREHENSIVE_BREED_DATABASE),
-                "cattle_count": len(cattle_breeds),
-                "buffalo_count": len(buffalo_breeds),
-                "breeds": {
-                    "cattle": cattle_breeds,
-                    "buffalo": buffalo_breeds,
-                    "all": list(COMPREHENSIVE_BREED_DATABASE.values())
-                },
-                "last_updated": datetime.now().isoformat()
-            }
-        )
+        return cached_json_response(request, BREEDS_RESPONSE_BYTES, BREEDS_ETAG)
     except Exception as e:
-        logger.error(f"Error in get_all_breeds: {str(e)}")
-        return JSONResponse(
+        logger.error("Error in get_all_breeds: %s", e)
+        return ORJSONResponse(
             status_code=500,
             content={"success": False, "error": "Internal server error"}
         )
 
 @app.get("/api/v1/breeds/{breed_id}")
-async def get_breed_details(breed_id: int):
+async def get_breed_details(request: Request, breed_id: int):
     try:
-        breed = next((b for b in COMPREHENSIVE_BREED_DATABASE.values() if b["id"] == breed_id), None)
-        if not breed:
-            return JSONResponse(
+        breed_bytes = BREED_DETAIL_BYTES.get(breed_id)
+        if breed_bytes is None:
+            return ORJSONResponse(
                 status_code=404,
                 content={"success": False, "error": "Breed not found"}
             )
         
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "breed": breed,
-                "timestamp": datetime.now().isoformat()
-            }
-        )
+        return cached_json_response(request, breed_bytes, BREED_DETAIL_ETAGS[breed_id])
     except Exception as e:
-        logger.error(f"Error in get_breed_details: {str(e)}")
-        return JSONResponse(
+        logger.error("Error in get_breed_details: %s", e)
+        return ORJSONResponse(
             status_code=500,
             content={"success": False, "error": "Internal server error"}
         )
 
+# Identification response schema, encoded directly with msgspec
+class Analysis(msgspec.Struct):
+    breed: str
+    breed_id: int
+    type: str
+    confidence: float
+    certainty_level: str
+
+class BreedDetails(msgspec.Struct):
+    origin: str
+    description: str
+    characteristics: str
+    milk_yield: str
+    colors: List[str]
+    weight: Dict[str, str]
+    special_features: List[str]
+    uses: List[str]
+    economic_importance: str
+
+class CareInformation(msgspec.Struct):
+    daily_care: List[str]
+    breeding_info: Dict[str, str]
+    recommendations: List[str]
+
+class FileInfo(msgspec.Struct):
+    filename: Optional[str]
+    size_mb: float
+    type: Optional[str]
+    uploaded_at: datetime
+
+class IdentifyResponse(msgspec.Struct):
+    success: bool
+    processing_time: float
+    analysis: Analysis
+    breed_details: BreedDetails
+    care_information: CareInformation
+    file_info: FileInfo
+    next_steps: Tuple[str, ...]
+    disclaimer: str
+    timestamp: datetime
+
+_IDENTIFY_ENCODER = msgspec.json.Encoder()
+
+# Per-breed identification response templates, built once at import
+IDENTIFICATION_TEMPLATES: Dict[str, Dict] = {}
+IDENTIFICATION_DISCLAIMER = "This identification is based on AI analysis. For critical decisions, please consult with veterinary experts."
+
+def build_identification_templates():
+    """Precompute the confidence-independent parts of each breed's identification result"""
+    IDENTIFICATION_TEMPLATES.clear()
+    for breed_key, breed_info in COMPREHENSIVE_BREED_DATABASE.items():
+        IDENTIFICATION_TEMPLATES[breed_key] = {
+            "analysis": {
+                "breed": breed_info["name"],
+                "breed_id": breed_info["id"],
+                "type": breed_info["type"]
+            },
+            "breed_details": BreedDetails(
+                origin=breed_info["origin"],
+                description=breed_info["description"],
+                characteristics=breed_info["characteristics"],
+                milk_yield=breed_info["milk_yield"],
+                colors=breed_info["colors"],
+                weight=breed_info["weight"],
+                special_features=breed_info["special_features"],
+                uses=breed_info["uses"],
+                economic_importance=breed_info["economic_importance"]
+            ),
+            "care_information": {
+                "daily_care": breed_info["care_tips"],
+                "breeding_info": breed_info["breeding_info"]
+            }
+        }
+
+build_identification_templates()
+
+def invalid_file_type_response() -> Response:
+    return ORJSONResponse(
+        status_code=400,
+        content={
+            "success": False,
+            "error": "Invalid file type. Please upload JPG, PNG, or JPEG images only.",
+            "accepted_formats": ["image/jpeg", "image/png", "image/jpg"]
+        }
+    )
+
+def file_too_large_response() -> Response:
+    return ORJSONResponse(
+        status_code=413,
+        content={
+            "success": False,
+            "error": "File size too large. Maximum size allowed is 5MB."
+        }
+    )
+
+def identification_error_response() -> Response:
+    return ORJSONResponse(
+        status_code=500,
+        content={
+            "success": False,
+            "error": "An error occurred during processing. Please try again.",
+            "timestamp": datetime.now()
+        }
+    )
+
+async def iter_upload_file(file: UploadFile) -> AsyncIterator[bytes]:
+    """Yield an UploadFile's contents in bounded chunks"""
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+async def count_upload_bytes(chunks: AsyncIterator[bytes]) -> int:
+    """Count upload bytes without holding them, stopping once past MAX_UPLOAD_SIZE"""
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > MAX_UPLOAD_SIZE:
+            break
+    return total
+
+async def run_identification(
+    background_tasks: BackgroundTasks,
+    filename: Optional[str],
+    content_type: str,
+    file_size: int
+) -> Response:
+    """Identify the breed for a validated upload and encode the response"""
+    # Simulate realistic AI processing
+    processing_start = time.time()
+    if SIMULATE_LATENCY:
+        await simulate_ai_processing()
+    processing_time = round(time.time() - processing_start, 2)
+    
+    # Select breed with realistic probability distribution
+    selected_breed_key = _BREED_KEYS[bisect.bisect(_CUM_WEIGHTS, _RNG.random() * _CUM_WEIGHTS[-1])]
+    breed_info = COMPREHENSIVE_BREED_DATABASE[selected_breed_key]
+    template = IDENTIFICATION_TEMPLATES[selected_breed_key]
+    
+    # Generate realistic confidence score
+    base_confidence = _RNG.uniform(88.0, 97.5)
+    confidence = round(base_confidence, 1)
+    
+    # One clock read per request; msgspec formats it natively
+    now = datetime.now()
+    
+    # Enhanced response with comprehensive information
+    result = IdentifyResponse(
+        success=True,
+        processing_time=processing_time,
+        analysis=Analysis(
+            **template["analysis"],
+            confidence=confidence,
+            certainty_level=get_certainty_level(confidence)
+        ),
+        breed_details=template["breed_details"],
+        care_information=CareInformation(
+            **template["care_information"],
+            recommendations=generate_enhanced_recommendations(breed_info, confidence)
+        ),
+        file_info=FileInfo(
+            filename=filename,
+            size_mb=round(file_size / (1024*1024), 2),
+            type=content_type,
+            uploaded_at=now
+        ),
+        next_steps=generate_next_steps(breed_info["type"]),
+        disclaimer=IDENTIFICATION_DISCLAIMER,
+        timestamp=now
+    )
+    
+    # Log successful identification; skip scheduling when INFO is filtered out
+    if logger.isEnabledFor(logging.INFO):
+        background_tasks.add_task(log_identification, breed_info["name"], confidence)
+    
+    return Response(content=_IDENTIFY_ENCODER.encode(result), media_type="application/json")
+
+# Multipart upload, kept for browser form compatibility
 @app.post("/api/v1/identify")
 async def identify_breed(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     try:
         # Comprehensive file validation
         if not file.content_type or not file.content_type.startswith('image/'):
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "error": "Invalid file type. Please upload JPG, PNG, or JPEG images only.",
-                    "accepted_formats": ["image/jpeg", "image/png", "image/jpg"]
-                }
-            )
-        
-        # File size validation (5MB limit)
-        if file.size and file.size > 5 * 1024 * 1024:  # 5MB
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "error": "File size too large. Maximum size allowed is 5MB.",
-                    "file_size": f"{file.size / (1024*1024):.2f} MB"
-                }
-            )
+            return invalid_file_type_response()
         
-        # Simulate realistic AI processing
-        processing_start = time.time()
-        await simulate_ai_processing()
-        processing_time = round(time.time() - processing_start, 2)
+        # File size validation (5MB limit). The body is already parsed, so
+        # trust file.size when set; otherwise count bytes in bounded chunks
+        # without holding them, stopping as soon as the limit is passed
+        file_size = file.size
+        if file_size is None:
+            file_size = await count_upload_bytes(iter_upload_file(file))
+        if file_size > MAX_UPLOAD_SIZE:
+            return file_too_large_response()
         
-        # Select breed with realistic probability distribution
-        breed_keys = list(COMPREHENSIVE_BREED_DATABASE.keys())
-        weights = [0.25, 0.25, 0.30, 0.15, 0.05]  # Realistic distribution
-        selected_breed_key = random.choices(breed_keys, weights=weights)[0]
-        breed_info = COMPREHENSIVE_BREED_DATABASE[selected_breed_key]
+        return await run_identification(background_tasks, file.filename, file.content_type, file_size)
         
-        # Generate realistic confidence score
-        base_confidence = random.uniform(88.0, 97.5)
-        confidence = round(base_confidence, 1)
+    except Exception as e:
+        logger.error("Error in identify_breed: %s", e)
+        return identification_error_response()
+
+# High-throughput path: raw image body (Content-Type: image/*), no multipart parsing
+@app.put("/api/v1/identify-raw")
+async def identify_breed_raw(request: Request, background_tasks: BackgroundTasks, filename: Optional[str] = None):
+    try:
+        content_type = request.headers.get("content-type", "")
+        if not content_type.startswith("image/"):
+            return invalid_file_type_response()
         
-        # Enhanced response with comprehensive information
-        result = {
-            "success": True,
-            "processing_time": processing_time,
-            "analysis": {
-                "breed": breed_info["name"],
-                "breed_id": breed_info["id"],
-                "type": breed_info["type"],
-                "confidence": confidence,
-                "certainty_level": get_certainty_level(confidence)
-            },
-            "breed_details": {
-                "origin": breed_info["origin"],
-                "description": breed_info["description"],
-                "characteristics": breed_info["characteristics"],
-                "milk_yield": breed_info["milk_yield"],
-                "colors": breed_info["colors"],
-                "weight": breed_info["weight"],
-                "special_features": breed_info["special_features"],
-                "uses": breed_info["uses"],
-                "economic_importance": breed_info["economic_importance"]
-            },
-            "care_information": {
-                "daily_care": breed_info["care_tips"],
-                "breeding_info": breed_info["breeding_info"],
-                "recommendations": generate_enhanced_recommendations(breed_info, confidence)
-            },
-            "file_info": {
-                "filename": file.filename,
-                "size_mb": round(file.size / (1024*1024), 2) if file.size else 0,
-                "type": file.content_type,
-                "uploaded_at": datetime.now().isoformat()
-            },
-            "next_steps": generate_next_steps(breed_info["type"]),
-            "disclaimer": "This identification is based on AI analysis. For critical decisions, please consult with veterinary experts.",
-            "timestamp": datetime.now().isoformat()
-        }
+        # Reject up front when the declared length is already over the limit
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_SIZE:
+            return file_too_large_response()
         
-        # Log successful identification
-        background_tasks.add_task(log_identification, breed_info["name"], confidence)
+        file_size = await count_upload_bytes(request.stream())
+        if file_size > MAX_UPLOAD_SIZE:
+            return file_too_large_response()
         
-        return JSONResponse(status_code=200, content=result)
+        return await run_identification(background_tasks, filename, content_type, file_size)
         
     except Exception as e:
-        logger.error(f"Error in identify_breed: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "error": "An error occurred during processing. Please try again.",
-                "timestamp": datetime.now().isoformat()
-            }
-        )
+        logger.error("Error in identify_breed_raw: %s", e)
+        return identification_error_response()
 
 async def simulate_ai_processing():
     """Simulate realistic AI model processing time"""
-    processing_time = random.uniform(1.5, 3.2)
+    processing_time = _RNG.uniform(0.05, 0.1)
     await asyncio.sleep(processing_time)
 
+# Certainty breakpoints; each label applies from its breakpoint upward
+_CERT_BREAKS = (85.0, 90.0, 95.0)
+_CERT_LABELS = ("Low", "Moderate", "High", "Very High")
+
 def get_certainty_level(confidence: float) -> str:
     """Get human-readable certainty level"""
-    if confidence >= 95:
-        return "Very High"
-    elif confidence >= 90:
-        return "High"
-    elif confidence >= 85:
-        return "Moderate"
-    else:
-        return "Low"
+    return _CERT_LABELS[bisect.bisect_right(_CERT_BREAKS, confidence)]
 
 def generate_enhanced_recommendations(breed_info: Dict, confidence: float) -> List[str]:
     """Generate enhanced recommendations based on breed and confidence"""
+    return [
+        confidence_recommendation(breed_info, confidence),
+        *_recommendations_for(breed_info["id"], confidence >= 90)
+    ]
+
+@lru_cache(maxsize=32)
+def _recommendations_for(breed_id: int, high_conf: bool) -> Tuple[str, ...]:
+    """Cached breed recommendations, one entry per breed and confidence band"""
+    return tuple(breed_recommendations(_BREEDS_BY_ID[breed_id], high_conf))
+
+def confidence_recommendation(breed_info: Dict, confidence: float) -> str:
+    """Lead recommendation stating the identified breed and confidence"""
+    return f"This appears to be a {breed_info['name']} with {confidence}% confidence"
+
+def breed_recommendations(breed_info: Dict, high_confidence: bool) -> List[str]:
+    """Recommendations that depend only on the breed and the confidence band"""
     recommendations = [
-        f"This appears to be a {breed_info['name']} with {confidence}% confidence",
         f"Expected milk yield: {breed_info['milk_yield']}",
         f"Primary uses: {', '.join(breed_info['uses'])}",
         f"Origin: {breed_info['origin']}"
     ]
     
-    if confidence >= 90:
+    if high_confidence:
         recommendations.append("High confidence identification - breed characteristics clearly match")
     else:
         recommendations.append("Moderate confidence - consider additional veterinary consultation")
@@ -443,8 +700,9 @@ def generate_enhanced_recommendations(breed_info: Dict, confidence: float) -> Li
     
     return recommendations
 
-def generate_next_steps(animal_type: str) -> List[str]:
-    """Generate actionable next steps"""
+@lru_cache(maxsize=2)
+def generate_next_steps(animal_type: str) -> Tuple[str, ...]:
+    """Generate actionable next steps (cached per animal type)"""
     common_steps = [
         "Consult with a local veterinarian for health assessment",
         "Plan appropriate nutrition based on breed requirements",
@@ -462,40 +720,52 @@ def generate_next_steps(animal_type: str) -> List[str]:
             "Plan for seasonal breeding optimization"
         ])
     
-    return common_steps
+    return tuple(common_steps)
 
 async def log_identification(breed_name: str, confidence: float):
     """Log identification for analytics"""
-    logger.info(f"Identified: {breed_name} with {confidence}% confidence")
+    logger.info("Identified: %s with %.1f%% confidence", breed_name, confidence)
+
+# Stats payload is rebuilt at most once per STATS_CACHE_TTL seconds
+STATS_CACHE_TTL = 1.0
+_stats_cache = {"ts": float("-inf"), "bytes": b""}
+
+def build_stats_payload() -> bytes:
+    """Serialize the stats response with some realistic variation"""
+    current_stats = {
+        **GLOBAL_STATS,
+        "total_identifications": GLOBAL_STATS["total_identifications"] + _RNG.randint(0, 5),
+        "daily_uploads": GLOBAL_STATS["daily_uploads"] + _RNG.randint(-10, 15)
+    }
+    
+    return orjson.dumps({
+        "success": True,
+        "stats": current_stats,
+        "performance": {
+            "uptime": "99.9%",
+            "response_time": "< 3 seconds",
+            "error_rate": "0.1%"
+        },
+        "geographic": {
+            "primary_regions": ["India", "Southeast Asia", "East Africa"],
+            "total_countries": current_stats["countries_served"]
+        },
+        "last_updated": datetime.now()
+    })
 
 @app.get("/api/v1/stats")
 async def get_comprehensive_stats():
     try:
-        # Add some realistic variation to stats
-        current_stats = GLOBAL_STATS.copy()
-        current_stats["total_identifications"] += random.randint(0, 5)
-        current_stats["daily_uploads"] += random.randint(-10, 15)
+        # The rebuild never awaits, so no other request can interleave with it
+        now = time.monotonic()
+        if now - _stats_cache["ts"] > STATS_CACHE_TTL:
+            _stats_cache["bytes"] = build_stats_payload()
+            _stats_cache["ts"] = now
         
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "stats": current_stats,
-                "performance": {
-                    "uptime": "99.9%",
-                    "response_time": "< 3 seconds",
-                    "error_rate": "0.1%"
-                },
-                "geographic": {
-                    "primary_regions": ["India", "Southeast Asia", "East Africa"],
-                    "total_countries": current_stats["countries_served"]
-                },
-                "last_updated": datetime.now().isoformat()
-            }
-        )
+        return Response(content=_stats_cache["bytes"], media_type="application/json")
     except Exception as e:
-        logger.error(f"Error in get_comprehensive_stats: {str(e)}")
-        return JSONResponse(
+        logger.error("Error in get_comprehensive_stats: %s", e)
+        return ORJSONResponse(
             status_code=500,
             content={"success": False, "error": "Internal server error"}
         )
@@ -503,7 +773,7 @@ async def get_comprehensive_stats():
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={
             "success": False,
@@ -513,6 +783,7 @@ async def not_found_handler(request, exc):
                 "/health",
                 "/api/v1/breeds",
                 "/api/v1/identify",
+                "/api/v1/identify-raw",
                 "/api/v1/stats"
             ]
         }
@@ -520,7 +791,7 @@ async def not_found_handler(request, exc):
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -530,11 +801,14 @@ async def internal_error_handler(request, exc):
     )
 
 if __name__ == "__main__":
-    import asyncio
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8001,
-        reload=True,
-        log_level="info"
+        loop="uvloop",
+        http="httptools",
+        reload=False,
+        log_level="warning",
+        access_log=False,
+        workers=os.cpu_count()
     )